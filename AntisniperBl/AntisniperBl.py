@@ -4,6 +4,7 @@ from typing import Type, TypeVar
 from datetime import datetime
 
 import asyncio
+import time
 import traceback
 
 from aiohttp import ClientSession, ContentTypeError
@@ -16,6 +17,9 @@ class Plugin:
     disabled = False
     version = "0.0.1"
 
+    HISTORY_SIZE = 100
+    WARMUP_SIZE = 50
+
     def __init__(
         self,
         logger: Logger,
@@ -43,6 +47,12 @@ class Plugin:
         self.headers = {}
         self.blacklist_cache = {}
 
+        self.history = {}
+        self.warmed = set()
+        self.lookups = 0
+        self.hits = 0
+        self.warm_hits = 0
+
         self.api = "https://api.antisniper.net/"
 
         logger.info("[AntisniperBL] Plugin has been initialised!")
@@ -84,11 +94,19 @@ class Plugin:
             self.key = key
             self.headers["Apikey"] = self.key
 
+        self.history = self.settings.getSetting("Antisniper-History") or {}
+
+        if self.key and not self.disabled:
+            self.warm_up()
+
 
     def on_unload(self) -> None:
         """
         Called when the plugin is unloaded
         """
+        self.log_hit_rate()
+        self.settings.updateSetting("Antisniper-History", self.history)
+
         self.logger.info("[AntisniperBL] Plugin has been unloaded!")
 
 
@@ -97,6 +115,10 @@ class Plugin:
         Called when the who command is executed
         """
         self.update_blacklist(players)
+        self.warm_up_after_lobby()
+
+        self.log_hit_rate()
+        self.settings.updateSetting("Antisniper-History", self.history)
 
 
     def on_list(self, players: object) -> None:
@@ -104,6 +126,10 @@ class Plugin:
         Called when the list command is executed
         """
         self.update_blacklist(players)
+        self.warm_up_after_lobby()
+
+        self.log_hit_rate()
+        self.settings.updateSetting("Antisniper-History", self.history)
 
 
     def on_player_insert(self, player: object) -> None:
@@ -114,6 +140,15 @@ class Plugin:
             f"[AntisniperBL] Player: {player.username} has been inserted! Looking up..."
         )
 
+        if player.uuid != "":
+            self.record_encounter(player)
+
+            self.lookups += 1
+            if player.username in self.blacklist_cache:
+                self.hits += 1
+                if player.username in self.warmed:
+                    self.warm_hits += 1
+
         if player.username in self.blacklist_cache:
             self.insert_player(player, self.blacklist_cache[player.username])
         else:
@@ -212,6 +247,131 @@ class Plugin:
         self.blacklist_cache[player] = data
 
 
+    def record_encounter(self, player: object) -> None:
+        """
+        Record the player in the encounter history, evicting the least likely players once full
+
+        :param player: The player to record
+        """
+        entry = self.history.setdefault(player.username, {"count": 0})
+        entry["count"] += 1
+        entry["last"] = time.time()
+
+        if len(self.history) > self.HISTORY_SIZE:
+            del self.history[
+                min(
+                    (username for username in self.history if username != player.username),
+                    key=self.history_score,
+                )
+            ]
+
+
+    def history_score(self, username: str) -> float:
+        """
+        Score a player of the encounter history, by encounters decayed over the days since last seen
+
+        :param username: The username of the player
+        :return: The score, higher is more likely to be seen again
+        """
+        entry = self.history[username]
+        days = (time.time() - entry.get("last", 0)) / 86400
+        return entry.get("count", 0) / (1 + days)
+
+
+    def rank_history(self) -> list:
+        """
+        Rank the encounter history, most likely to be seen again first
+
+        :return: The usernames, ordered by score
+        """
+        return sorted(self.history, key=self.history_score, reverse=True)
+
+
+    def warm_up(self) -> None:
+        """
+        Look up the most likely players in the background
+
+        At most WARMUP_SIZE players are looked up, in one request plus one
+        per 20 blacklist tokens.
+        """
+        if "warmup" in self.bl_threads and not self.bl_threads["warmup"].isFinished():
+            return
+
+        players = [
+            username
+            for username in self.rank_history()
+            if username not in self.blacklist_cache
+        ][: self.WARMUP_SIZE]
+
+        if not players:
+            return
+
+        self.logger.info(
+            f"[AntisniperBL] Warming up the cache with {len(players)} player(s)..."
+        )
+
+        try:
+            self.bl_threads["warmup"] = BlacklistWorker(
+                api=self.api,
+                headers=self.headers,
+                key=self.key,
+                players=players,
+                bl_tokens=self.bl_tokens,
+            )
+            self.bl_threads["warmup"].playerData.connect(self.add_to_warm_cache)
+            self.bl_threads["warmup"].finished.connect(
+                lambda: self.logger.info(
+                    f"[AntisniperBL] Warm-up finished, {len(self.warmed)} player(s) warmed up so far!"
+                )
+            )
+            self.bl_threads["warmup"].start()
+        except:
+            self.logger.error(
+                f"[AntisniperBL] Failed to warm up the cache!\n\nTraceback: {traceback.format_exc()}"
+            )
+
+
+    def warm_up_after_lobby(self) -> None:
+        """
+        Warm up the cache again once the lobby lookup has finished
+        """
+        if "all" in self.bl_threads and not self.bl_threads["all"].isFinished():
+            self.bl_threads["all"].finished.connect(self.warm_up)
+        else:
+            self.warm_up()
+
+
+    def add_to_warm_cache(self, player: object, data: object) -> None:
+        """
+        Add a warmed up player to the cache, keeping a blacklist hit from
+        one of the token requests over the token-less response
+        """
+        if player in self.blacklist_cache and player not in self.warmed:
+            return
+
+        self.warmed.add(player)
+
+        if self.blacklist_cache.get(player, {}).get("blacklisted") and not data.get(
+            "blacklisted"
+        ):
+            return
+
+        self.add_to_cache(player, data)
+
+
+    def log_hit_rate(self) -> None:
+        """
+        Log the cache hit rate, and how much of it comes from the warm-up
+        """
+        if not self.lookups:
+            return
+
+        self.logger.info(
+            f"[AntisniperBL] Cache hit rate: {self.hits}/{self.lookups} ({self.hits / self.lookups:.1%}), "
+            f"{self.warm_hits} hit(s) ({self.warm_hits / self.lookups:.1%}) from the warm-up."
+        )
+
+
     def ask_for_apikey(self) -> None:
         """
         Ask for the API key
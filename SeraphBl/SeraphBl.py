@@ -3,6 +3,7 @@ from typing import Type, TypeVar
 
 
 import asyncio
+import time
 import traceback
 
 from aiohttp import ClientSession, ContentTypeError
@@ -17,6 +18,9 @@ class Plugin:
 
     OVERRIDE_global_blacklist = True
 
+    HISTORY_SIZE = 100
+    WARMUP_BUDGET = 20
+
     def __init__(
         self,
         logger: Logger,
@@ -42,6 +46,12 @@ class Plugin:
         self.sl_threads = {}
         self.cache = {}
 
+        self.history = {}
+        self.warmed = set()
+        self.lookups = 0
+        self.hits = 0
+        self.warm_hits = 0
+
         self.api = "https://api.seraph.si"
         self.headers = {
             "User-Agent": f"Polsu Overlay - Seraph Blacklist Plugin [{self.version}]",
@@ -71,13 +81,37 @@ class Plugin:
             self.key = key
             self.headers["seraph-api-key"] = self.key
 
+        self.history = self.settings.getSetting("Seraph-History") or {}
+
+        if self.key and not self.disabled:
+            self.warmUp()
+
 
     def on_unload(self) -> None:
         """
         Called when the plugin is unloaded
         """
+        self.logHitRate()
+        self.settings.updateSetting("Seraph-History", self.history)
+
         self.logger.info("[SeraphBL] Plugin has been unloaded!")
 
+
+    def on_who(self, players: object) -> None:
+        """
+        Called when the who command is executed
+        """
+        self.logHitRate()
+        self.settings.updateSetting("Seraph-History", self.history)
+
+
+    def on_list(self, players: object) -> None:
+        """
+        Called when the list command is executed
+        """
+        self.logHitRate()
+        self.settings.updateSetting("Seraph-History", self.history)
+
     
     def on_player_insert(self, player: object) -> None:
         """
@@ -85,6 +119,15 @@ class Plugin:
         """
         self.logger.info(f"[SeraphBL] Player: {player.username} has been inserted! Looking up...")
 
+        if player.uuid != "":
+            self.recordEncounter(player)
+
+            self.lookups += 1
+            if player.uuid in self.cache:
+                self.hits += 1
+                if player.uuid in self.warmed:
+                    self.warm_hits += 1
+
         if player.uuid in self.cache:
             self.insertPlayer(player, self.cache[player.uuid])
         else:
@@ -141,6 +184,9 @@ class Plugin:
         else:
             self.cache[player.uuid] = data
 
+            if player.uuid in self.history:
+                self.history[player.uuid]["encounters"] = data.get('statistics', {}).get('encounters', 0)
+
             tooltip = ""
             icon = None
 
@@ -184,6 +230,111 @@ class Plugin:
                 self.table.setLineColour(player.uuid, "#00AA00")
 
 
+    def recordEncounter(self, player: object) -> None:
+        """
+        Record the player in the encounter history, evicting the least likely players once full
+
+        :param player: The player object
+        """
+        entry = self.history.setdefault(player.uuid, {"count": 0, "encounters": 0})
+        entry["count"] += 1
+        entry["last"] = time.time()
+
+        if len(self.history) > self.HISTORY_SIZE:
+            del self.history[min((uuid for uuid in self.history if uuid != player.uuid), key=self.historyScore)]
+
+
+    def historyScore(self, uuid: str) -> tuple:
+        """
+        Score a player of the encounter history, by encounters decayed over the days since last seen
+
+        :param uuid: The UUID of the player
+        :return: The score, higher is more likely to be seen again
+        """
+        entry = self.history[uuid]
+        days = (time.time() - entry.get("last", 0)) / 86400
+        return (entry.get("count", 0) / (1 + days), entry.get("encounters", 0))
+
+
+    def rankHistory(self) -> list:
+        """
+        Rank the encounter history, most likely to be seen again first
+
+        :return: The UUIDs, ordered by score
+        """
+        return sorted(self.history, key=self.historyScore, reverse=True)
+
+
+    def warmUp(self) -> None:
+        """
+        Look up the most likely players in the background, within the request budget
+        """
+        uuids = [uuid for uuid in self.rankHistory() if uuid not in self.cache][:self.WARMUP_BUDGET]
+
+        if not uuids:
+            return
+
+        self.logger.info(f"[SeraphBL] Warming up the cache with {len(uuids)} player(s)...")
+
+        try:
+            worker = WarmupWorker(
+                api=self.api,
+                headers=self.headers,
+                uuids=uuids,
+            )
+            worker.warmData.connect(self.addToCache)
+            worker.finished.connect(lambda: self.warmUpFinished(worker))
+
+            self.bl_threads["warmup"] = worker
+            self.bl_threads["warmup"].start()
+        except:
+            self.logger.error(f"[SeraphBL] Failed to warm up the cache!\n\nTraceback: {traceback.format_exc()}")
+
+
+    def warmUpFinished(self, worker: object) -> None:
+        """
+        Log how much of the warm-up budget was cached, and how much failed
+
+        :param worker: The finished warm-up worker
+        """
+        total = len(worker.uuids)
+
+        if worker.failed:
+            self.logger.warning(f"[SeraphBL] Warm-up finished, {total - worker.failed}/{total} player(s) cached, {worker.failed} request(s) failed!")
+        else:
+            self.logger.info(f"[SeraphBL] Warm-up finished, {total}/{total} player(s) cached!")
+
+
+    def addToCache(self, uuid: str, data: dict) -> None:
+        """
+        Add a warmed up player to the cache
+
+        :param uuid: The UUID of the player
+        :param data: The player data
+        """
+        if uuid in self.cache:
+            return
+
+        self.cache[uuid] = data
+        self.warmed.add(uuid)
+
+        if uuid in self.history:
+            self.history[uuid]["encounters"] = data.get('statistics', {}).get('encounters', 0)
+
+
+    def logHitRate(self) -> None:
+        """
+        Log the cache hit rate, and how much of it comes from the warm-up
+        """
+        if not self.lookups:
+            return
+
+        self.logger.info(
+            f"[SeraphBL] Cache hit rate: {self.hits}/{self.lookups} ({self.hits / self.lookups:.1%}), "
+            f"{self.warm_hits} hit(s) ({self.warm_hits / self.lookups:.1%}) from the warm-up."
+        )
+
+
     def askForAPIKey(self) -> None:
         """
         Ask for the API key
@@ -204,6 +355,7 @@ class Plugin:
         else:
             self.settings.updateSetting("Seraph-APIKey", key)
             self.key = key
+            self.headers["seraph-api-key"] = self.key
 
 
 #┏━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┓\n
@@ -266,6 +418,41 @@ class BlacklistWorker(QThread):
             return {}
 
 
+class WarmupWorker(BlacklistWorker):
+    """
+    The worker class, used to warm up the blacklist cache
+    """
+    warmData = pyqtSignal(str, dict)
+
+    def __init__(self, api: str, headers: dict, uuids: list) -> None:
+        """
+        Initialise the class
+
+        :param api: The API URL
+        :param headers: The API headers
+        :param uuids: The UUIDs of the players, one request each
+        """
+        super().__init__(api=api, headers=headers, key=headers.get("seraph-api-key"), player=None)
+        self.uuids = uuids
+        self.failed = 0
+
+
+    def run(self) -> None:
+        """
+        Run the thread
+        """
+        for uuid in self.uuids:
+            try:
+                data = asyncio.run(self.getPlayer(uuid))
+            except Exception:
+                data = {}
+
+            if data:
+                self.warmData.emit(uuid, data)
+            else:
+                self.failed += 1
+
+
 class SafelistWorker(QThread):
     """
     The worker class, used to get safelist data